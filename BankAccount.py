@@ -1,5 +1,28 @@
-import datetime
-import time # Used for simulating time passing in tests
+import enum
+import logging
+import math
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Bound once so the hot paths do a single global lookup per timestamp
+_monotonic = time.monotonic
+
+# Account states held in BankAccount._status
+_ACTIVE, _INACTIVE, _CLOSED = 0, 1, 2
+
+def _to_cents(amount):
+  """
+  Converts a currency amount to whole cents.
+
+  Raises:
+      ValueError: If the amount is NaN or infinite.
+  """
+  if not math.isfinite(amount):
+    raise ValueError("Amount must be a finite number.")
+  return int(round(amount * 100))
 
 class InsufficientFundsError(Exception):
   """Custom exception for insufficient funds."""
@@ -20,17 +43,54 @@ class VerificationRequiredError(Exception):
   """Custom exception when withdrawal requires verification."""
   pass
 
+# Messages shared by every raise of these errors. A fresh exception is
+# raised each time: a shared instance would keep the last caller's
+# traceback (and frames) alive and is not safe to unwind from two threads.
+_VERIFICATION_REQUIRED_MSG = "Withdrawal requires client identity verification."
+_ACCOUNT_CLOSED_MSG = "Operation failed: Account is permanently closed."
+
+class WithdrawResult(enum.IntEnum):
+  """Outcome of BankAccount.try_withdraw()."""
+  OK = 0
+  NEEDS_VERIFICATION = 1
+  INSUFFICIENT_FUNDS = 2
+  CLOSED = 3
+
 class BankAccount:
   """
   Manages funds in a bank account with deposit, withdrawal,
   closing, and activation features.
+
+  Instances use __slots__ (no per-instance __dict__); subclasses that add
+  attributes must declare their own __slots__.
   """
 
+  __slots__ = (
+      '_balance_cents',
+      '_account_holder',
+      '_status',
+      '_last_activity_time',
+      '_lock',
+      '_version',
+      '__weakref__',
+  )
+
   # Define the inactivity period in seconds (e.g., 30 days)
   # For testing purposes, we might use a shorter duration.
   # INACTIVITY_PERIOD_SECONDS = 30 * 24 * 60 * 60 # 30 days
   INACTIVITY_PERIOD_SECONDS = 10 # Shorter duration for easier testing
 
+  # Balance in cents of every open account, keyed by id(account).
+  # Kept in step with _balance_cents so totals need no per-account lookups.
+  _balance_index = {}
+
+  # Every open account; closed accounts can never change state again, so
+  # they are dropped and inactivity sweeps only visit accounts that can.
+  _active_accounts = weakref.WeakSet()
+  # Guards adds/discards on _active_accounts and the sweep's snapshot of it;
+  # WeakSet iteration fails if the set changes size from another thread.
+  _active_accounts_lock = threading.Lock()
+
   def __init__(self, initial_balance=0.0, account_holder="Unknown"):
     """
     Initializes the bank account.
@@ -38,34 +98,87 @@ class BankAccount:
     Args:
         initial_balance (float): The starting balance. Defaults to 0.0.
         account_holder (str): The name of the account holder.
+
+    Raises:
+        ValueError: If the initial balance is negative or not finite.
     """
+    # Balance is held as integer cents to keep arithmetic exact
+    balance_cents = _to_cents(initial_balance)
     if initial_balance < 0:
         raise ValueError("Initial balance cannot be negative.")
 
-    self._balance = float(initial_balance)
+    self._balance_cents = balance_cents
+    BankAccount._balance_index[id(self)] = self._balance_cents
     self._account_holder = account_holder
-    self._is_active = True
-    self._is_closed = False
-    # Store the timestamp of the last operation
-    self._last_activity_time = datetime.datetime.now()
-    print(f"Account for {self._account_holder} created with balance: ${self._balance:.2f}")
+    # Guards the read-check-write sequences on balance and status
+    self._lock = threading.Lock()
+    # Bumped on every committed change; lets withdraw() check without the lock
+    self._version = 0
+    self._status = _ACTIVE
+    # Store the timestamp of the last operation (time.monotonic() seconds)
+    self._update_activity_time()
+    with BankAccount._active_accounts_lock:
+      BankAccount._active_accounts.add(self)
+    if logger.isEnabledFor(logging.DEBUG):
+      logger.debug("Account for %s created with balance: $%.2f",
+                   self._account_holder, self._balance_cents / 100)
 
   @property
   def balance(self):
     """Returns the current account balance."""
     # Optionally check status before allowing balance check
     # self._check_status_for_read()
-    return self._balance
+    return self._balance_cents / 100.0
+
+  @classmethod
+  def total_balance_cents(cls):
+    """Returns the combined balance, in cents, of all open accounts."""
+    return sum(cls._balance_index.values())
+
+  @classmethod
+  def check_all_for_deactivation(cls):
+    """
+    Runs check_for_deactivation() on every open account.
+    This is the entry point for an external scheduler sweep.
+    """
+    with cls._active_accounts_lock:
+      accounts = list(cls._active_accounts)
+    # Check outside the class lock; each account takes its own lock
+    for account in accounts:
+      account.check_for_deactivation()
+
+  def __getstate__(self):
+    # The lock cannot be pickled or copied; __setstate__ creates a new one
+    state = {}
+    for cls in type(self).__mro__:
+      for name in getattr(cls, '__slots__', ()):
+        if name not in ('_lock', '__weakref__') and hasattr(self, name):
+          state[name] = getattr(self, name)
+    return state
+
+  def __setstate__(self, state):
+    for name, value in state.items():
+      setattr(self, name, value)
+    self._lock = threading.Lock()
+    # Register the restored account the same way __init__ does
+    if self._status != _CLOSED:
+      BankAccount._balance_index[id(self)] = self._balance_cents
+      with BankAccount._active_accounts_lock:
+        BankAccount._active_accounts.add(self)
+
+  def __del__(self):
+    # Drop the index entry so a recycled id() cannot inherit this balance
+    BankAccount._balance_index.pop(id(self), None)
 
   @property
   def is_active(self):
     """Returns True if the account is active, False otherwise."""
-    return self._is_active
+    return self._status == _ACTIVE
 
   @property
   def is_closed(self):
     """Returns True if the account is closed, False otherwise."""
-    return self._is_closed
+    return self._status == _CLOSED
 
   @property
   def account_holder(self):
@@ -74,12 +187,16 @@ class BankAccount:
 
   @property
   def last_activity_time(self):
-    """Returns the timestamp of the last activity."""
-    return self._last_activity_time
+    """Returns the timestamp of the last activity as a datetime."""
+    # Imported here: only this conversion and the test helper need datetime.
+    import datetime
+    # The monotonic clock has no fixed epoch, so convert via the elapsed time.
+    elapsed = _monotonic() - self._last_activity_time
+    return datetime.datetime.now() - datetime.timedelta(seconds=elapsed)
 
   def _update_activity_time(self):
     """Updates the last activity timestamp."""
-    self._last_activity_time = datetime.datetime.now()
+    self._last_activity_time = _monotonic()
 
   def _check_status_for_operation(self):
     """
@@ -87,159 +204,493 @@ class BankAccount:
     Reactivates the account if it was inactive.
     Raises errors if closed.
     """
-    if self._is_closed:
-      raise AccountClosedError("Operation failed: Account is permanently closed.")
+    status = self._status
+    if status == _CLOSED:
+      raise AccountClosedError(_ACCOUNT_CLOSED_MSG)
 
-    if not self._is_active:
+    if status == _INACTIVE:
       self._reactivate() # Reactivate on operation attempt
 
   def _reactivate(self):
     """Reactivates the account and triggers the associated action."""
-    if not self._is_active and not self._is_closed:
-      self._is_active = True
-      self._trigger_reactivation_action()
-      # Update activity time upon reactivation itself? Or rely on the operation?
-      # Let's rely on the operation updating it.
+    with self._lock:
+      if self._status != _INACTIVE:
+        return
+      self._status = _ACTIVE
+      # Make a concurrent optimistic withdrawal that saw _INACTIVE retry
+      self._version += 1
+    # As in deposit(), the hook runs outside the lock
+    self._trigger_reactivation_action()
+    # Update activity time upon reactivation itself? Or rely on the operation?
+    # Let's rely on the operation updating it.
 
   def _trigger_reactivation_action(self):
     """Placeholder for the action taken upon account reactivation."""
     # In a real system, this could send an email, SMS, or log the event.
-    print(f"Account for {self._account_holder} has been reactivated.")
+    logger.info("Account for %s has been reactivated.", self._account_holder)
 
   def deposit(self, amount):
     """
     Deposits funds into the account. Always possible unless the account is closed.
 
     Args:
-        amount (float): The amount to deposit. Must be positive.
+        amount (float): The amount to deposit. Must be at least one cent.
 
     Raises:
-        ValueError: If the amount is not positive.
+        ValueError: If the amount is not finite or rounds to less than one cent.
         AccountClosedError: If the account is closed.
     """
-    if amount <= 0:
+    # Validate in cents: an amount that rounds to zero cents is not a deposit
+    amt = _to_cents(amount)
+    if amt <= 0:
       raise ValueError("Deposit amount must be positive.")
 
-    # Check status *before* proceeding
-    self._check_status_for_operation() # This will reactivate if needed
-
-    self._balance += amount
-    self._update_activity_time()
-    print(f"Deposited ${amount:.2f}. New balance: ${self._balance:.2f}")
+    with self._lock:
+      # Status check is inlined here (see _check_status_for_operation)
+      status = self._status
+      if status == _CLOSED:
+        raise AccountClosedError(_ACCOUNT_CLOSED_MSG)
+
+      # Inlined _reactivate() (status was read under the lock)
+      reactivated = status == _INACTIVE
+      if reactivated:
+        self._status = _ACTIVE
+
+      new_bal = self._balance_cents + amt
+      self._balance_cents = new_bal
+      BankAccount._balance_index[id(self)] = new_bal
+      self._last_activity_time = _monotonic()
+      self._version += 1
+
+    # The hook runs outside the lock so it may itself operate on the account
+    if reactivated:
+      self._trigger_reactivation_action()
+    if logger.isEnabledFor(logging.DEBUG):
+      logger.debug("Deposited $%.2f. New balance: $%.2f", amount, new_bal / 100)
 
   def withdraw(self, amount, is_verified=False):
     """
     Withdraws funds from the account after identity verification.
 
     Args:
-        amount (float): The amount to withdraw. Must be positive.
+        amount (float): The amount to withdraw. Must be at least one cent.
         is_verified (bool): Flag indicating if the client's identity has been verified.
 
     Raises:
-        ValueError: If the amount is not positive.
+        ValueError: If the amount is not finite or rounds to less than one cent.
         VerificationRequiredError: If identity is not verified.
         AccountClosedError: If the account is closed.
         InsufficientFundsError: If the amount exceeds the balance.
     """
-    if amount <= 0:
-      raise ValueError("Withdrawal amount must be positive.")
+    result, bal = self._withdraw(amount, is_verified)
+    if result == WithdrawResult.OK:
+      return
+    if result == WithdrawResult.NEEDS_VERIFICATION:
+      raise VerificationRequiredError(_VERIFICATION_REQUIRED_MSG)
+    if result == WithdrawResult.CLOSED:
+      raise AccountClosedError(_ACCOUNT_CLOSED_MSG)
+    # Report the balance the failed check saw, not a later re-read
+    raise InsufficientFundsError(f"Withdrawal failed: Insufficient funds. Available: ${bal / 100:.2f}")
+
+  def try_withdraw(self, amount, is_verified=False):
+    """
+    Withdraws funds like withdraw(), but reports failures as a result code
+    instead of raising, for callers that handle many withdrawals in bulk.
 
-    # 1. Check verification first, as per requirement 1
-    if not is_verified:
-      raise VerificationRequiredError("Withdrawal requires client identity verification.")
+    Args:
+        amount (float): The amount to withdraw. Must be at least one cent.
+        is_verified (bool): Flag indicating if the client's identity has been verified.
 
-    # 2. Check account status (closed/inactive)
-    self._check_status_for_operation() # This will reactivate if needed
+    Returns:
+        WithdrawResult: OK if the withdrawal was made, otherwise the reason
+        it was refused.
 
-    # 3. Check funds
-    if amount > self._balance:
-      raise InsufficientFundsError(f"Withdrawal failed: Insufficient funds. Available: ${self._balance:.2f}")
+    Raises:
+        ValueError: If the amount is not finite or rounds to less than one cent.
+    """
+    return self._withdraw(amount, is_verified)[0]
 
-    # 4. Perform withdrawal
-    self._balance -= amount
-    self._update_activity_time()
-    print(f"Withdrew ${amount:.2f}. New balance: ${self._balance:.2f}")
+  def _withdraw(self, amount, is_verified):
+    """
+    Shared body of withdraw() and try_withdraw(). Returns a tuple of the
+    WithdrawResult and the balance in cents seen by the last check (None
+    if no balance was read).
+    """
+    # Validate in cents: an amount that rounds to zero cents is not a withdrawal
+    amt = _to_cents(amount)
+    if amt <= 0:
+      raise ValueError("Withdrawal amount must be positive.")
+
+    # 1. Check verification first, as per requirement 1
+    if not is_verified:
+      return WithdrawResult.NEEDS_VERIFICATION, None
+
+    # Checks run without the lock against a snapshot of the account; the
+    # lock is only taken to commit, and the whole attempt is retried if
+    # another operation committed in between (optimistic locking).
+    while True:
+      version = self._version
+
+      # 2. Check account status (inlined; see _check_status_for_operation)
+      status = self._status
+      if status == _CLOSED:
+        return WithdrawResult.CLOSED, None
+
+      # 3. Check funds
+      bal = self._balance_cents
+      if amt > bal:
+        return WithdrawResult.INSUFFICIENT_FUNDS, bal
+      new_bal = bal - amt
+
+      with self._lock:
+        if self._version != version:
+          continue
+
+        # 4. Reactivate only once the withdrawal is known to succeed
+        # (inlined _reactivate(); the version check ensures status is current)
+        reactivated = status == _INACTIVE
+        if reactivated:
+          self._status = _ACTIVE
+
+        # 5. Perform withdrawal
+        self._balance_cents = new_bal
+        BankAccount._balance_index[id(self)] = new_bal
+        self._last_activity_time = _monotonic()
+        self._version = version + 1
+      break
+
+    # The hook runs outside the lock so it may itself operate on the account
+    if reactivated:
+      self._trigger_reactivation_action()
+    if logger.isEnabledFor(logging.DEBUG):
+      logger.debug("Withdrew $%.2f. New balance: $%.2f", amount, new_bal / 100)
+    return WithdrawResult.OK, new_bal
 
   def close_account(self):
     """
     Permanently closes the account. Operations will no longer be possible.
     """
-    if self._is_closed:
-      print("Account is already closed.")
-      return
-
-    # Potentially add checks here, e.g., balance must be zero before closing.
-    # For now, just marking as closed.
-    self._is_closed = True
-    self._is_active = False # A closed account is implicitly inactive
-    print(f"Account for {self._account_holder} has been closed.")
-    # Should we clear the balance on close? Depends on requirements.
-    # self._balance = 0.0
+    with self._lock:
+      if self._status == _CLOSED:
+        logger.info("Account is already closed.")
+        return
+
+      # Potentially add checks here, e.g., balance must be zero before closing.
+      # For now, just marking as closed.
+      self._status = _CLOSED # A closed account is implicitly inactive
+      self._version += 1
+      with BankAccount._active_accounts_lock:
+        BankAccount._active_accounts.discard(self)
+      BankAccount._balance_index.pop(id(self), None)
+      # Swap in the closed-state methods; subclasses keep their own class
+      if type(self) is BankAccount:
+        self.__class__ = _ClosedBankAccount
+      logger.info("Account for %s has been closed.", self._account_holder)
+      # Should we clear the balance on close? Depends on requirements.
+      # self._balance_cents = 0
 
   def check_for_deactivation(self):
       """
       Checks if the account should be deactivated based on the inactivity period.
       This method would typically be called by an external process or scheduler.
       """
-      if not self._is_active or self._is_closed:
-          return # Already inactive or closed
+      with self._lock:
+          if self._status != _ACTIVE:
+              return # Already inactive or closed
 
-      time_since_last_activity = datetime.datetime.now() - self._last_activity_time
-      if time_since_last_activity.total_seconds() > self.INACTIVITY_PERIOD_SECONDS:
-          self._deactivate()
+          # INACTIVITY_PERIOD_SECONDS is read on every check so that changing
+          # it (e.g. in tests) applies to existing accounts too
+          if _monotonic() - self._last_activity_time > self.INACTIVITY_PERIOD_SECONDS:
+              self._deactivate()
 
   def _deactivate(self):
       """Marks the account as inactive."""
-      if self._is_active and not self._is_closed:
-          self._is_active = False
-          print(f"Account for {self._account_holder} has been deactivated due to inactivity.")
+      if self._status == _ACTIVE:
+          self._status = _INACTIVE
+          self._version += 1
+          logger.info("Account for %s has been deactivated due to inactivity.", self._account_holder)
 
   # --- Helper methods primarily for testing ---
   def force_deactivate(self):
       """Manually forces the account to be inactive (for testing)."""
-      if not self._is_closed:
-          self._is_active = False
-          print(f"Account for {self._account_holder} manually set to inactive.")
+      with self._lock:
+          if self._status == _CLOSED:
+              return
+          self._status = _INACTIVE
+          self._version += 1
+          logger.info("Account for %s manually set to inactive.", self._account_holder)
 
   def set_last_activity_time(self, dt):
-      """Manually sets the last activity time (for testing inactivity)."""
-      if isinstance(dt, datetime.datetime):
-          self._last_activity_time = dt
+      """
+      Manually sets the last activity time (for testing inactivity).
+
+      Args:
+          dt (datetime.datetime | float): A wall-clock datetime, or a
+              time.monotonic() timestamp.
+      """
+      if isinstance(dt, (int, float)) and not isinstance(dt, bool):
+          self._last_activity_time = float(dt)
       else:
-          raise TypeError("dt must be a datetime.datetime object")
+          import datetime
+          if not isinstance(dt, datetime.datetime):
+              raise TypeError("dt must be a datetime.datetime object or a float timestamp")
+          elapsed = (datetime.datetime.now() - dt).total_seconds()
+          self._last_activity_time = _monotonic() - elapsed
+
+
+class _ClosedBankAccount(BankAccount):
+  """
+  Class a BankAccount is switched to when it is closed. Its operations
+  fail (or do nothing) straight away instead of checking the status.
+  """
+
+  __slots__ = ()
+
+  def deposit(self, amount):
+    if _to_cents(amount) <= 0:
+      raise ValueError("Deposit amount must be positive.")
+    raise AccountClosedError(_ACCOUNT_CLOSED_MSG)
+
+  def _withdraw(self, amount, is_verified):
+    if _to_cents(amount) <= 0:
+      raise ValueError("Withdrawal amount must be positive.")
+    if not is_verified:
+      return WithdrawResult.NEEDS_VERIFICATION, None
+    return WithdrawResult.CLOSED, None
+
+  def close_account(self):
+    logger.info("Account is already closed.")
+
+  def check_for_deactivation(self):
+    return
+
+  def force_deactivate(self):
+    return
+
+
+class BankPortfolio:
+  """
+  Holds many accounts in a struct-of-arrays layout so batch operations
+  (bulk deposits, totals, inactivity sweeps) run as vectorized NumPy calls
+  instead of one Python method call per account.
+
+  Accounts are addressed by the integer index returned from add_account().
+  Requires NumPy, which is imported when the first portfolio is created.
+  """
+
+  @property
+  def INACTIVITY_PERIOD_SECONDS(self):
+    """
+    The inactivity period, shared with BankAccount. Read on every sweep
+    so changing BankAccount.INACTIVITY_PERIOD_SECONDS applies here too.
+    """
+    return BankAccount.INACTIVITY_PERIOD_SECONDS
+
+  # Largest balance an account may hold, in cents. deposit_batch() enforces
+  # it to float64 precision; it sits far enough below the int64 limit that
+  # no balance can wrap.
+  MAX_BALANCE_CENTS = 2 ** 62
+
+  def __init__(self, capacity=16):
+    """
+    Initializes an empty portfolio.
+
+    Args:
+        capacity (int): Number of accounts to allocate room for up front.
+    """
+    import numpy as np
+    self._np = np
+    self._size = 0
+    self._account_holders = []
+    self.balances_cents = np.zeros(capacity, dtype=np.int64)
+    self.status = np.zeros(capacity, dtype=np.uint8)
+    self.last_activity = np.zeros(capacity, dtype=np.float64)
+
+  def __len__(self):
+    return self._size
+
+  def _grow(self):
+    """Doubles the capacity of the backing arrays."""
+    np = self._np
+    capacity = max(2 * len(self.balances_cents), 1)
+    for name in ('balances_cents', 'status', 'last_activity'):
+      old = getattr(self, name)
+      new = np.zeros(capacity, dtype=old.dtype)
+      new[:self._size] = old[:self._size]
+      setattr(self, name, new)
+
+  def add_account(self, initial_balance=0.0, account_holder="Unknown"):
+    """
+    Adds an active account to the portfolio.
+
+    Args:
+        initial_balance (float): The starting balance. Defaults to 0.0.
+        account_holder (str): The name of the account holder.
+
+    Returns:
+        int: The index of the new account.
+    """
+    if initial_balance < 0:
+      raise ValueError("Initial balance cannot be negative.")
+    balance_cents = _to_cents(initial_balance)
+    if balance_cents > self.MAX_BALANCE_CENTS:
+      raise OverflowError("Initial balance exceeds the maximum balance.")
+
+    if self._size == len(self.balances_cents):
+      self._grow()
+    index = self._size
+    self.balances_cents[index] = balance_cents
+    self.status[index] = _ACTIVE
+    self.last_activity[index] = _monotonic()
+    self._account_holders.append(account_holder)
+    self._size += 1
+    return index
+
+  def balance(self, index):
+    """Returns the balance of the account at the given index."""
+    if not 0 <= index < self._size:
+      raise IndexError("Account index out of range.")
+    return int(self.balances_cents[index]) / 100.0
+
+  def close_account(self, index):
+    """Permanently closes the account at the given index."""
+    if not 0 <= index < self._size:
+      raise IndexError("Account index out of range.")
+    self.status[index] = _CLOSED
+
+  def deposit_batch(self, indices, amounts):
+    """
+    Deposits amounts into many accounts at once. Deposits to closed
+    accounts are skipped; inactive accounts are reactivated, firing
+    _trigger_reactivation_action() once per account.
+
+    Args:
+        indices (array-like of int): Account indices; may repeat.
+        amounts (array-like of float): Amount to deposit for each index.
+            Each must be at least one cent.
+
+    Returns:
+        numpy.ndarray: Boolean mask of the deposits that were applied.
+
+    Raises:
+        ValueError: If any amount is not finite, rounds to less than one
+            cent, or the shapes differ.
+        OverflowError: If an account would exceed MAX_BALANCE_CENTS.
+        TypeError: If the indices are not integers.
+        IndexError: If any index does not name an account.
+    """
+    np = self._np
+    # No forced dtype: casting would silently truncate e.g. 0.9 to account 0
+    idx = np.asarray(indices)
+    if idx.size == 0:
+      idx = idx.astype(np.intp)
+    elif not np.issubdtype(idx.dtype, np.integer):
+      raise TypeError("Account indices must be integers.")
+    amt = np.asarray(amounts, dtype=np.float64)
+    if idx.shape != amt.shape:
+      raise ValueError("indices and amounts must have the same shape.")
+    # Reject NaN/inf before the int64 cast, which would turn them into
+    # arbitrary (typically INT64_MIN) balances without an error
+    if (~np.isfinite(amt)).any():
+      raise ValueError("Deposit amount must be a finite number.")
+    scaled = np.rint(amt * 100)
+    if (scaled <= 0).any():
+      raise ValueError("Deposit amount must be positive.")
+    # Range-check before the int64 cast, which would otherwise wrap
+    if (scaled > self.MAX_BALANCE_CENTS).any():
+      raise OverflowError("Deposit amount exceeds the maximum balance.")
+    cents = scaled.astype(np.int64)
+    if idx.size and (idx.min() < 0 or idx.max() >= self._size):
+      raise IndexError("Account index out of range.")
+    idx = idx.astype(np.intp, copy=False)
+
+    mask = self.status[idx] != _CLOSED
+    applied = idx[mask]
+    # np.add.at wraps silently on int64 overflow, so check the resulting
+    # balances first. The sums are estimated in float64; its rounding error
+    # is far smaller than the gap between MAX_BALANCE_CENTS and 2**63.
+    n = self._size
+    projected = self.balances_cents[:n] + np.bincount(
+        applied, weights=cents[mask], minlength=n)
+    if (projected > self.MAX_BALANCE_CENTS).any():
+      raise OverflowError("Deposit would exceed the maximum balance.")
+    reactivated = np.unique(applied[self.status[applied] == _INACTIVE])
+    np.add.at(self.balances_cents, applied, cents[mask])
+    self.status[applied] = _ACTIVE
+    self.last_activity[applied] = _monotonic()
+    # Fire the reactivation action once per reactivated account, as
+    # BankAccount does
+    for index in reactivated.tolist():
+      self._trigger_reactivation_action(index)
+    return mask
+
+  def _trigger_reactivation_action(self, index):
+    """Placeholder for the action taken upon account reactivation."""
+    # In a real system, this could send an email, SMS, or log the event.
+    logger.info("Account for %s has been reactivated.", self._account_holders[index])
+
+  def total_balance_cents(self):
+    """Returns the combined balance, in cents, of all accounts."""
+    # The int64 sum of many balances near MAX_BALANCE_CENTS would wrap, so
+    # sum the high and low 31-bit halves separately and combine exactly.
+    balances = self.balances_cents[:self._size]
+    high = int((balances >> 31).sum())
+    low = int((balances & (2 ** 31 - 1)).sum())
+    return (high << 31) + low
+
+  def check_for_deactivation_all(self):
+    """
+    Deactivates every active account whose last activity is older than
+    the inactivity period.
+
+    Returns:
+        int: The number of accounts deactivated.
+    """
+    n = self._size
+    status = self.status[:n]
+    stale = (_monotonic() - self.last_activity[:n]) > self.INACTIVITY_PERIOD_SECONDS
+    stale &= status == _ACTIVE
+    status[stale] = _INACTIVE
+    return int(stale.sum())
 
 
 # Example Usage (Optional - primarily tested via unit tests)
-try:
-    # Changed "Alice" to "Saka" here
-    acc = BankAccount(100, "Saka")
-    acc.deposit(50)
-    acc.withdraw(30, is_verified=True)
-    # acc.withdraw(10, is_verified=False) # Raises VerificationRequiredError
-    # acc.withdraw(200, is_verified=True) # Raises InsufficientFundsError
-
-    # Simulate inactivity for testing deactivation/reactivation
-    print("\nSimulating inactivity...")
-    # Backdate last activity time significantly for testing check_for_deactivation
-    # Use the short INACTIVITY_PERIOD_SECONDS defined above for this example to work quickly
-    past_time = datetime.datetime.now() - datetime.timedelta(seconds=BankAccount.INACTIVITY_PERIOD_SECONDS + 1)
-    acc.set_last_activity_time(past_time)
-    print(f"Set last activity time to: {acc.last_activity_time}")
-    acc.check_for_deactivation() # Manually trigger the check
-    print(f"Account active after check: {acc.is_active}")
-
-    # Wait a moment to ensure the check_for_deactivation logic has time if run concurrently
-    # time.sleep(0.1) # Usually not needed unless INACTIVITY_PERIOD_SECONDS is extremely short
-
-    print("\nAttempting deposit on (now potentially) inactive account...")
-    acc.deposit(10) # Should reactivate if inactive, then deposit
-    print(f"Account active after deposit: {acc.is_active}")
-    print(f"Current balance: ${acc.balance:.2f}")
-
-
-    print("\nClosing account...")
-    acc.close_account()
-    # acc.deposit(5) # Raises AccountClosedError
-
-except (ValueError, InsufficientFundsError, AccountClosedError, VerificationRequiredError) as e:
-    print(f"Error: {e}")
+if __name__ == "__main__":
+    import datetime
+
+    # Show the account event log on stdout when run as a script
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
+    try:
+        # Changed "Alice" to "Saka" here
+        acc = BankAccount(100, "Saka")
+        acc.deposit(50)
+        acc.withdraw(30, is_verified=True)
+        # acc.withdraw(10, is_verified=False) # Raises VerificationRequiredError
+        # acc.withdraw(200, is_verified=True) # Raises InsufficientFundsError
+
+        # Simulate inactivity for testing deactivation/reactivation
+        print("\nSimulating inactivity...")
+        # Backdate last activity time significantly for testing check_for_deactivation
+        # Use the short INACTIVITY_PERIOD_SECONDS defined above for this example to work quickly
+        past_time = datetime.datetime.now() - datetime.timedelta(seconds=BankAccount.INACTIVITY_PERIOD_SECONDS + 1)
+        acc.set_last_activity_time(past_time)
+        print(f"Set last activity time to: {acc.last_activity_time}")
+        acc.check_for_deactivation() # Manually trigger the check
+        print(f"Account active after check: {acc.is_active}")
+
+        # Wait a moment to ensure the check_for_deactivation logic has time if run concurrently
+        # time.sleep(0.1) # Usually not needed unless INACTIVITY_PERIOD_SECONDS is extremely short
+
+        print("\nAttempting deposit on (now potentially) inactive account...")
+        acc.deposit(10) # Should reactivate if inactive, then deposit
+        print(f"Account active after deposit: {acc.is_active}")
+        print(f"Current balance: ${acc.balance:.2f}")
+
+
+        print("\nClosing account...")
+        acc.close_account()
+        # acc.deposit(5) # Raises AccountClosedError
+
+    except (ValueError, InsufficientFundsError, AccountClosedError, VerificationRequiredError) as e:
+        print(f"Error: {e}")
@@ -0,0 +1,582 @@
+import copy
+import datetime
+import gc
+import pickle
+import threading
+import time
+
+import pytest
+
+from BankAccount import (
+    _ACTIVE,
+    _CLOSED,
+    _INACTIVE,
+    AccountClosedError,
+    BankAccount,
+    InsufficientFundsError,
+    VerificationRequiredError,
+    WithdrawResult,
+)
+
+
+# --- last_activity_time / set_last_activity_time ---
+
+def test_backdated_datetime_round_trips():
+  acc = BankAccount(10, "Test")
+  past = datetime.datetime.now() - datetime.timedelta(seconds=30)
+  acc.set_last_activity_time(past)
+  assert isinstance(acc.last_activity_time, datetime.datetime)
+  assert abs((acc.last_activity_time - past).total_seconds()) < 1
+
+
+def test_backdated_datetime_triggers_deactivation():
+  acc = BankAccount(10, "Test")
+  past = datetime.datetime.now() - datetime.timedelta(
+      seconds=BankAccount.INACTIVITY_PERIOD_SECONDS + 1)
+  acc.set_last_activity_time(past)
+  acc.check_for_deactivation()
+  assert not acc.is_active
+
+
+def test_recent_datetime_does_not_trigger_deactivation():
+  acc = BankAccount(10, "Test")
+  acc.set_last_activity_time(datetime.datetime.now())
+  acc.check_for_deactivation()
+  assert acc.is_active
+
+
+@pytest.mark.parametrize("value", [True, False, "yesterday", None, datetime.date.today()])
+def test_set_last_activity_time_rejects_bad_types(value):
+  acc = BankAccount(10, "Test")
+  with pytest.raises(TypeError):
+    acc.set_last_activity_time(value)
+
+
+# --- Amount validation ---
+
+NON_FINITE = [float("nan"), float("inf"), float("-inf")]
+
+
+@pytest.mark.parametrize("amount", NON_FINITE)
+def test_initial_balance_must_be_finite(amount):
+  with pytest.raises(ValueError):
+    BankAccount(amount, "Test")
+
+
+@pytest.mark.parametrize("amount", NON_FINITE)
+def test_deposit_and_withdraw_reject_non_finite_amounts(amount):
+  acc = BankAccount(10, "Test")
+  with pytest.raises(ValueError):
+    acc.deposit(amount)
+  with pytest.raises(ValueError):
+    acc.withdraw(amount, is_verified=True)
+  assert acc.balance == 10.0
+
+
+@pytest.mark.parametrize("amount", NON_FINITE)
+def test_closed_account_rejects_non_finite_amounts(amount):
+  acc = BankAccount(10, "Test")
+  acc.close_account()
+  with pytest.raises(ValueError):
+    acc.deposit(amount)
+  with pytest.raises(ValueError):
+    acc.try_withdraw(amount, is_verified=True)
+
+
+@pytest.mark.parametrize("amount", [0, -1, 0.004])
+def test_deposit_rejects_amounts_below_one_cent(amount):
+  acc = BankAccount(10, "Test")
+  with pytest.raises(ValueError):
+    acc.deposit(amount)
+  assert acc.balance == 10.0
+
+
+# --- try_withdraw / WithdrawResult ---
+
+def test_try_withdraw_ok_updates_balance():
+  acc = BankAccount(10, "Test")
+  assert acc.try_withdraw(4, is_verified=True) == WithdrawResult.OK
+  assert acc.balance == 6.0
+
+
+def test_try_withdraw_needs_verification_leaves_balance():
+  acc = BankAccount(10, "Test")
+  assert acc.try_withdraw(4) == WithdrawResult.NEEDS_VERIFICATION
+  assert acc.balance == 10.0
+
+
+def test_try_withdraw_insufficient_funds():
+  acc = BankAccount(10, "Test")
+  assert acc.try_withdraw(11, is_verified=True) == WithdrawResult.INSUFFICIENT_FUNDS
+  assert acc.balance == 10.0
+
+
+def test_try_withdraw_closed():
+  acc = BankAccount(10, "Test")
+  acc.close_account()
+  assert acc.try_withdraw(1, is_verified=True) == WithdrawResult.CLOSED
+
+
+def test_try_withdraw_checks_verification_before_closed():
+  acc = BankAccount(10, "Test")
+  acc.close_account()
+  assert acc.try_withdraw(1) == WithdrawResult.NEEDS_VERIFICATION
+
+
+def test_try_withdraw_checks_closed_before_funds():
+  acc = BankAccount(10, "Test")
+  acc.close_account()
+  assert acc.try_withdraw(100, is_verified=True) == WithdrawResult.CLOSED
+
+
+@pytest.mark.parametrize("amount", [0, -1, 0.004])
+def test_try_withdraw_rejects_amounts_below_one_cent(amount):
+  acc = BankAccount(10, "Test")
+  with pytest.raises(ValueError):
+    acc.try_withdraw(amount, is_verified=True)
+
+
+def test_try_withdraw_reactivates_inactive_account():
+  acc = BankAccount(10, "Test")
+  acc.force_deactivate()
+  assert acc.try_withdraw(1, is_verified=True) == WithdrawResult.OK
+  assert acc.is_active
+
+
+def test_failed_try_withdraw_does_not_reactivate():
+  acc = BankAccount(10, "Test")
+  acc.force_deactivate()
+  assert acc.try_withdraw(100, is_verified=True) == WithdrawResult.INSUFFICIENT_FUNDS
+  assert not acc.is_active
+
+
+def test_withdraw_raises_for_each_result():
+  acc = BankAccount(10, "Test")
+  with pytest.raises(VerificationRequiredError):
+    acc.withdraw(1)
+  with pytest.raises(InsufficientFundsError, match=r"Available: \$10\.00"):
+    acc.withdraw(11, is_verified=True)
+  acc.close_account()
+  with pytest.raises(AccountClosedError):
+    acc.withdraw(1, is_verified=True)
+
+
+def test_each_failure_raises_a_fresh_exception():
+  acc = BankAccount(10, "Test")
+  errors = []
+  for _ in range(2):
+    with pytest.raises(VerificationRequiredError) as info:
+      acc.withdraw(1)
+    errors.append(info.value)
+  assert errors[0] is not errors[1]
+
+
+def test_caught_failure_does_not_keep_account_alive():
+  gc.collect()  # settle accounts left over from earlier tests
+  before_total = BankAccount.total_balance_cents()
+  before_active = len(BankAccount._active_accounts)
+
+  def fail_unverified():
+    acc = BankAccount(50, "Test")
+    try:
+      acc.withdraw(10)
+    except VerificationRequiredError:
+      pass
+
+  fail_unverified()
+  gc.collect()
+  assert BankAccount.total_balance_cents() == before_total
+  assert len(BankAccount._active_accounts) == before_active
+
+
+# --- Locking, copying and pickling ---
+
+def _pickle_copy(acc):
+  return pickle.loads(pickle.dumps(acc))
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, _pickle_copy])
+def test_open_account_round_trips(clone):
+  acc = BankAccount(12.5, "Test")
+  acc.force_deactivate()
+  dup = clone(acc)
+  assert dup is not acc
+  assert dup.balance == 12.5
+  assert dup.account_holder == "Test"
+  assert not dup.is_active and not dup.is_closed
+  assert dup._lock is not acc._lock
+  assert dup._lock.acquire(blocking=False)
+  dup._lock.release()
+  assert BankAccount._balance_index[id(dup)] == 1250
+  assert dup in BankAccount._active_accounts
+  dup.deposit(1)
+  assert dup.balance == 13.5 and dup.is_active
+  assert acc.balance == 12.5
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, _pickle_copy])
+def test_closed_account_round_trips(clone):
+  from BankAccount import _ClosedBankAccount
+  acc = BankAccount(7, "Test")
+  acc.close_account()
+  dup = clone(acc)
+  assert type(dup) is _ClosedBankAccount
+  assert dup.is_closed
+  assert dup.balance == 7.0
+  assert dup._lock is not acc._lock
+  assert id(dup) not in BankAccount._balance_index
+  assert dup not in BankAccount._active_accounts
+  with pytest.raises(AccountClosedError):
+    dup.deposit(1)
+
+
+def _run_with_timeout(target, timeout=5):
+  worker = threading.Thread(target=target, daemon=True)
+  worker.start()
+  worker.join(timeout)
+  return not worker.is_alive()
+
+
+def test_reactivation_hook_may_operate_on_the_account():
+  class Notifying(BankAccount):
+    __slots__ = ()
+
+    def _trigger_reactivation_action(self):
+      super()._trigger_reactivation_action()
+      self.deposit(1)  # e.g. a reactivation bonus
+
+  acc = Notifying(10, "Test")
+
+  def reactivate_twice():
+    acc.force_deactivate()
+    acc.deposit(1)
+    acc.force_deactivate()
+    acc.withdraw(1, is_verified=True)
+
+  assert _run_with_timeout(reactivate_twice), "reactivation hook deadlocked"
+  assert acc.is_active
+  assert acc.balance == 12.0
+
+
+class _YieldingLock:
+  """Lock wrapper that gives up the GIL before acquiring, so other threads
+  run between a withdrawal's unlocked check and its commit."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+
+  def __enter__(self):
+    time.sleep(0)
+    return self._lock.__enter__()
+
+  def __exit__(self, *exc):
+    return self._lock.__exit__(*exc)
+
+
+def test_concurrent_withdrawals_never_overdraw():
+  acc = BankAccount(10, "Test")
+  acc._lock = _YieldingLock()
+  start = threading.Barrier(8)
+  results = []
+
+  def drain():
+    start.wait()
+    for _ in range(500):
+      results.append(acc.try_withdraw(0.01, is_verified=True))
+
+  workers = [threading.Thread(target=drain) for _ in range(8)]
+  for worker in workers:
+    worker.start()
+  for worker in workers:
+    worker.join()
+  assert results.count(WithdrawResult.OK) == 1000
+  assert acc._balance_cents == 0
+  assert acc.balance == 0.0
+
+
+def test_check_status_for_operation_reactivates_under_version_bump():
+  class Counting(BankAccount):
+    __slots__ = ('fired',)
+
+    def _trigger_reactivation_action(self):
+      self.fired += 1
+
+  acc = Counting(10, "Test")
+  acc.fired = 0
+  acc.force_deactivate()
+  version = acc._version
+  acc._check_status_for_operation()
+  assert acc.is_active
+  assert acc._version == version + 1
+  acc._check_status_for_operation()
+  acc.withdraw(1, is_verified=True)
+  assert acc.fired == 1
+
+
+def test_check_status_for_operation_raises_when_closed():
+  acc = BankAccount(10, "Test")
+  acc.close_account()
+  with pytest.raises(AccountClosedError):
+    acc._check_status_for_operation()
+
+
+# --- Balance index and active set ---
+
+def test_new_account_is_indexed_and_active():
+  before = BankAccount.total_balance_cents()
+  acc = BankAccount(12.34, "Test")
+  assert BankAccount._balance_index[id(acc)] == 1234
+  assert acc in BankAccount._active_accounts
+  assert BankAccount.total_balance_cents() == before + 1234
+
+
+def test_balance_index_follows_deposit_and_withdraw():
+  acc = BankAccount(10, "Test")
+  acc.deposit(2.5)
+  acc.withdraw(1.25, is_verified=True)
+  assert BankAccount._balance_index[id(acc)] == 1125
+
+
+def test_close_account_leaves_index_and_active_set():
+  acc = BankAccount(10, "Test")
+  before = BankAccount.total_balance_cents()
+  acc.close_account()
+  assert id(acc) not in BankAccount._balance_index
+  assert acc not in BankAccount._active_accounts
+  assert BankAccount.total_balance_cents() == before - 1000
+
+
+def test_garbage_collected_account_leaves_index_and_active_set():
+  gc.collect()  # settle accounts left over from earlier tests
+  before_total = BankAccount.total_balance_cents()
+  before_active = len(BankAccount._active_accounts)
+
+  def make():
+    acc = BankAccount(50, "Test")
+    acc.deposit(1)
+    return id(acc)
+
+  acc_id = make()
+  gc.collect()
+  assert acc_id not in BankAccount._balance_index
+  assert BankAccount.total_balance_cents() == before_total
+  assert len(BankAccount._active_accounts) == before_active
+
+
+def test_check_all_for_deactivation_only_visits_open_accounts(monkeypatch):
+  stale = BankAccount(1, "Stale")
+  fresh = BankAccount(1, "Fresh")
+  closed = BankAccount(1, "Closed")
+  stale.set_last_activity_time(0.0)
+  closed.close_account()
+  visited = []
+  original = BankAccount.check_for_deactivation
+
+  def spy(self):
+    visited.append(self)
+    original(self)
+
+  monkeypatch.setattr(BankAccount, "check_for_deactivation", spy)
+  BankAccount.check_all_for_deactivation()
+  assert stale in visited and fresh in visited
+  assert closed not in visited
+  assert not stale.is_active
+  assert fresh.is_active
+
+
+def test_sweep_while_accounts_are_created_and_closed():
+  stop = threading.Event()
+  errors = []
+
+  def churn():
+    try:
+      while not stop.is_set():
+        for _ in range(50):
+          BankAccount(1, "Churn")
+        BankAccount(1, "Churn").close_account()
+    except Exception as exc:
+      errors.append(exc)
+
+  def sweep():
+    try:
+      for _ in range(300):
+        BankAccount.check_all_for_deactivation()
+    except Exception as exc:
+      errors.append(exc)
+    finally:
+      stop.set()
+
+  keep = [BankAccount(1, "Keep") for _ in range(200)]
+  workers = [threading.Thread(target=churn), threading.Thread(target=sweep)]
+  for worker in workers:
+    worker.start()
+  for worker in workers:
+    worker.join()
+  assert errors == []
+  assert all(acc in BankAccount._active_accounts for acc in keep)
+
+
+# --- Closed-account class swap ---
+
+def test_close_account_swaps_class():
+  from BankAccount import _ClosedBankAccount
+  acc = BankAccount(10, "Test")
+  acc.close_account()
+  assert type(acc) is _ClosedBankAccount
+  assert isinstance(acc, BankAccount)
+  assert acc.is_closed and not acc.is_active
+  assert acc.balance == 10.0
+  assert acc.account_holder == "Test"
+
+
+def test_closed_account_operations():
+  acc = BankAccount(10, "Test")
+  acc.close_account()
+  with pytest.raises(AccountClosedError):
+    acc.deposit(1)
+  with pytest.raises(ValueError):
+    acc.deposit(0)
+  with pytest.raises(VerificationRequiredError):
+    acc.withdraw(1)
+  with pytest.raises(AccountClosedError):
+    acc.withdraw(1, is_verified=True)
+  acc.close_account()
+  acc.check_for_deactivation()
+  acc.force_deactivate()
+  assert acc.is_closed
+  assert acc.balance == 10.0
+
+
+def test_subclass_keeps_its_class_when_closed():
+  class Sub(BankAccount):
+    __slots__ = ('extra',)
+
+  acc = Sub(10, "Test")
+  acc.close_account()
+  assert type(acc) is Sub
+  with pytest.raises(AccountClosedError):
+    acc.deposit(1)
+  assert acc.try_withdraw(1, is_verified=True) == WithdrawResult.CLOSED
+
+
+# --- BankPortfolio ---
+
+@pytest.fixture
+def portfolio():
+  pytest.importorskip("numpy")
+  from BankAccount import BankPortfolio
+  return BankPortfolio(capacity=1)
+
+
+def test_portfolio_add_account_grows_capacity(portfolio):
+  for i in range(5):
+    assert portfolio.add_account(i, f"Holder{i}") == i
+  assert len(portfolio) == 5
+  assert portfolio.balance(4) == 4.0
+  assert portfolio.total_balance_cents() == 1000
+
+
+def test_deposit_batch_repeated_indices_accumulate(portfolio):
+  portfolio.add_account(0)
+  portfolio.add_account(0)
+  mask = portfolio.deposit_batch([0, 0, 1, 0], [1, 2.5, 3, 0.01])
+  assert mask.tolist() == [True, True, True, True]
+  assert portfolio.balance(0) == 3.51
+  assert portfolio.balance(1) == 3.0
+
+
+def test_deposit_batch_skips_closed_accounts(portfolio):
+  portfolio.add_account(1)
+  portfolio.add_account(1)
+  portfolio.close_account(1)
+  mask = portfolio.deposit_batch([0, 1], [5, 5])
+  assert mask.tolist() == [True, False]
+  assert portfolio.balance(0) == 6.0
+  assert portfolio.balance(1) == 1.0
+
+
+def test_deposit_batch_reactivates_inactive_accounts_once(portfolio, monkeypatch):
+  portfolio.add_account(1)
+  portfolio.add_account(1)
+  portfolio.last_activity[:] -= portfolio.INACTIVITY_PERIOD_SECONDS + 1
+  assert portfolio.check_for_deactivation_all() == 2
+  fired = []
+  monkeypatch.setattr(portfolio, "_trigger_reactivation_action", fired.append)
+  portfolio.deposit_batch([0, 0], [1, 1])
+  assert fired == [0]
+  assert portfolio.status[0] == _ACTIVE
+  assert portfolio.status[1] == _INACTIVE
+
+
+@pytest.mark.parametrize("amount", [0, -1, 0.004, float("nan"), float("inf")])
+def test_deposit_batch_rejects_invalid_amounts(portfolio, amount):
+  portfolio.add_account(1)
+  with pytest.raises(ValueError):
+    portfolio.deposit_batch([0], [amount])
+  assert portfolio.balance(0) == 1.0
+
+
+@pytest.mark.parametrize("amounts", [[1e17], [5e16, 5e16], [3e16, 3e16], [1e300]])
+def test_deposit_batch_rejects_overflowing_deposits(portfolio, amounts):
+  portfolio.add_account(1)
+  with pytest.raises(OverflowError):
+    portfolio.deposit_batch([0] * len(amounts), amounts)
+  assert portfolio.balance(0) == 1.0
+
+
+def test_deposit_batch_overflow_check_is_per_account(portfolio):
+  for _ in range(2):
+    portfolio.add_account(0)
+  limit = portfolio.MAX_BALANCE_CENTS
+  # Each account stays at the limit even though the batch total exceeds it
+  portfolio.deposit_batch([0, 1], [limit / 100, limit / 100])
+  assert portfolio.total_balance_cents() == 2 * limit
+  with pytest.raises(OverflowError):
+    portfolio.deposit_batch([0], [limit / 100])
+  assert int(portfolio.balances_cents[0]) == limit
+
+
+def test_add_account_rejects_balance_above_maximum(portfolio):
+  with pytest.raises(OverflowError):
+    portfolio.add_account(1e300)
+  assert len(portfolio) == 0
+
+
+def test_deposit_batch_rejects_bad_indices(portfolio):
+  portfolio.add_account(1)
+  with pytest.raises(IndexError):
+    portfolio.deposit_batch([1], [1])
+
+
+@pytest.mark.parametrize("indices", [[0.9], [0.0], [True], ["0"]])
+def test_deposit_batch_rejects_non_integer_indices(portfolio, indices):
+  portfolio.add_account(1)
+  with pytest.raises(TypeError):
+    portfolio.deposit_batch(indices, [1])
+  assert portfolio.balance(0) == 1.0
+
+
+def test_deposit_batch_accepts_integer_arrays_and_empty_batches(portfolio):
+  import numpy as np
+  portfolio.add_account(1)
+  portfolio.deposit_batch(np.array([0], dtype=np.uint8), [1])
+  assert portfolio.deposit_batch([], []).tolist() == []
+  assert portfolio.balance(0) == 2.0
+
+
+def test_check_for_deactivation_all_ignores_recent_and_closed(portfolio):
+  for _ in range(3):
+    portfolio.add_account(1)
+  portfolio.last_activity[:2] -= portfolio.INACTIVITY_PERIOD_SECONDS + 1
+  portfolio.close_account(1)
+  assert portfolio.check_for_deactivation_all() == 1
+  assert portfolio.status.tolist()[:3] == [_INACTIVE, _CLOSED, _ACTIVE]
+
+
+def test_portfolio_follows_bank_account_inactivity_period(portfolio, monkeypatch):
+  portfolio.add_account(1)
+  portfolio.last_activity[0] -= 5
+  monkeypatch.setattr(BankAccount, "INACTIVITY_PERIOD_SECONDS", 1)
+  assert portfolio.INACTIVITY_PERIOD_SECONDS == 1
+  assert portfolio.check_for_deactivation_all() == 1
+  assert portfolio.status[0] == _INACTIVE